@@ -1,4 +1,3 @@
-from collections import namedtuple
 from typing import Union
 from enum import Enum
 import traceback
@@ -10,10 +9,14 @@ import os
 
 from .package_module import PackageModule
 from .package_slot import PackageSlot
-from .. import repositories, entities, exceptions, services
+from .. import repositories, entities, exceptions, services, assets
 
 logger = logging.getLogger(name='dtlpy')
 
+_MOCKIFY_INPUTS = {'Dataset': {'dataset_id': 'id'},
+                   'Item': {'item_id': 'id', 'dataset_id': 'id'},
+                   'Annotation': {'annotation_id': 'id', 'item_id': 'id', 'dataset_id': 'id'}}
+
 
 class RequirementOperator(str, Enum):
     EQUAL = '==',
@@ -28,6 +31,7 @@ class RequirementOperator(str, Enum):
 
 
 class PackageRequirement:
+    __slots__ = ('name', 'version', 'operator')
 
     def __init__(self, name: str, version: str = None, operator: str = None):
         self.name = name
@@ -81,7 +85,8 @@ class Package(entities.DlEntity):
     # sdk
     _client_api: services.ApiClient
     _revisions = None
-    __repositories = None
+    __repo_cache = None
+    _codebase_git = None
     _project = None
 
     def __repr__(self):
@@ -196,80 +201,79 @@ class Package(entities.DlEntity):
     # repositories #
     ################
     @property
-    def _repositories(self):
-        if self.__repositories is None:
-            reps = namedtuple('repositories',
-                              field_names=['executions', 'services', 'projects', 'packages', 'artifacts', 'codebases',
-                                           'models'])
-
-            self.__repositories = reps(
-                executions=repositories.Executions(client_api=self._client_api,
-                                                   project=self._project),
-                services=repositories.Services(client_api=self._client_api,
-                                               package=self,
-                                               project=self._project,
-                                               project_id=self.project_id),
-                projects=repositories.Projects(client_api=self._client_api),
-                packages=repositories.Packages(client_api=self._client_api,
-                                               project=self._project),
-                artifacts=repositories.Artifacts(client_api=self._client_api,
-                                                 project=self._project,
-                                                 project_id=self.project_id,
-                                                 package=self),
-                codebases=repositories.Codebases(client_api=self._client_api, project=self._project,
-                                                 project_id=self.project_id),
-                models=repositories.Models(client_api=self._client_api,
-                                           project=self._project,
-                                           package=self,
-                                           project_id=self.project_id)
-            )
-        return self.__repositories
+    def _repo_cache(self):
+        if self.__repo_cache is None:
+            self.__repo_cache = dict()
+        return self.__repo_cache
+
+    def _get_repo(self, name, factory):
+        """
+        Return the repository stored under name, building it with factory on first access
+        """
+        repo = self._repo_cache.get(name)
+        if repo is None:
+            repo = factory()
+            self._repo_cache[name] = repo
+        return repo
 
     @property
     def executions(self):
-        assert isinstance(self._repositories.executions, repositories.Executions)
-        return self._repositories.executions
+        return self._get_repo('executions', lambda: repositories.Executions(client_api=self._client_api,
+                                                                            project=self._project))
 
     @property
     def services(self):
-        assert isinstance(self._repositories.services, repositories.Services)
-        return self._repositories.services
+        return self._get_repo('services', lambda: repositories.Services(client_api=self._client_api,
+                                                                        package=self,
+                                                                        project=self._project,
+                                                                        project_id=self.project_id))
 
     @property
     def projects(self):
-        assert isinstance(self._repositories.projects, repositories.Projects)
-        return self._repositories.projects
+        return self._get_repo('projects', lambda: repositories.Projects(client_api=self._client_api))
 
     @property
     def packages(self):
-        assert isinstance(self._repositories.packages, repositories.Packages)
-        return self._repositories.packages
+        return self._get_repo('packages', lambda: repositories.Packages(client_api=self._client_api,
+                                                                        project=self._project))
 
     @property
     def codebases(self):
-        assert isinstance(self._repositories.codebases, repositories.Codebases)
-        return self._repositories.codebases
+        return self._get_repo('codebases', lambda: repositories.Codebases(client_api=self._client_api,
+                                                                          project=self._project,
+                                                                          project_id=self.project_id))
 
     @property
     def artifacts(self):
-        assert isinstance(self._repositories.artifacts, repositories.Artifacts)
-        return self._repositories.artifacts
+        return self._get_repo('artifacts', lambda: repositories.Artifacts(client_api=self._client_api,
+                                                                          project=self._project,
+                                                                          project_id=self.project_id,
+                                                                          package=self))
 
     @property
     def models(self):
-        assert isinstance(self._repositories.models, repositories.Models)
-        return self._repositories.models
+        return self._get_repo('models', lambda: repositories.Models(client_api=self._client_api,
+                                                                    project=self._project,
+                                                                    package=self,
+                                                                    project_id=self.project_id))
 
     ##############
     # properties #
     ##############
+    def _get_codebase_git(self):
+        codebase = self.codebase
+        if codebase is None or codebase.type != entities.PackageCodebaseType.ITEM:
+            return dict()
+        # cache by item id - every access to self.codebase builds a new entity and would fetch the item again
+        if self._codebase_git is None or self._codebase_git[0] != codebase.item_id:
+            self._codebase_git = (codebase.item_id, codebase.item.metadata.get('git', dict()))
+        return self._codebase_git[1]
+
     @property
     def git_status(self):
         status = 'Git status unavailable'
         try:
-            if self.codebase.type == entities.PackageCodebaseType.ITEM:
-                if 'git' in self.codebase.item.metadata:
-                    status = self.codebase.item.metadata['git'].get('status', status)
+            status = self._get_codebase_git().get('status', status)
         except Exception:
             logging.debug('Error getting codebase')
         return status
@@ -278,9 +282,7 @@ class Package(entities.DlEntity):
     def git_log(self):
         log = 'Git log unavailable'
         try:
-            if self.codebase.type == entities.PackageCodebaseType.ITEM:
-                if 'git' in self.codebase.item.metadata:
-                    log = self.codebase.item.metadata['git'].get('log', log)
+            log = self._get_codebase_git().get('log', log)
         except Exception:
             logging.debug('Error getting codebase')
         return log
@@ -520,51 +522,39 @@ class Package(entities.DlEntity):
 
     @staticmethod
     def _mockify_input(input_type):
-        _json = dict()
-        if input_type == 'Dataset':
-            _json.update({'dataset_id': 'id'})
-        if input_type == 'Item':
-            _json.update({'item_id': 'id', 'dataset_id': 'id'})
-        if input_type == 'Annotation':
-            _json.update({'annotation_id': 'id', 'item_id': 'id', 'dataset_id': 'id'})
-        return _json
+        return dict(_MOCKIFY_INPUTS.get(input_type, dict()))
 
     def mockify(self, local_path=None, module_name=None, function_name=None):
-        if local_path is None:
-            local_path = os.getcwd()
-
         if module_name is None:
             if self.modules:
                 module_name = self.modules[0].name
             else:
                 raise exceptions.PlatformException('400', 'Package has no modules')
 
-        modules = [module for module in self.modules if module.name == module_name]
-        if not modules:
+        module = next((module for module in self.modules if module.name == module_name), None)
+        if module is None:
             raise exceptions.PlatformException('404', 'Module not found: {}'.format(module_name))
-        module = modules[0]
 
+        functions = module.functions
         if function_name is None:
-            funcs = [func for func in module.functions]
-            if funcs:
-                func = funcs[0]
+            if functions:
+                func = functions[0]
             else:
                 raise exceptions.PlatformException('400', 'Module: {} has no functions'.format(module_name))
         else:
-            funcs = [func for func in module.functions if func.name == function_name]
-            if not funcs:
+            func = next((func for func in functions if func.name == function_name), None)
+            if func is None:
                 raise exceptions.PlatformException('404', 'Function not found: {}'.format(function_name))
-            func = funcs[0]
 
-        mock = dict()
-        for module in self.modules:
-            mock['module_name'] = module.name
-            mock['function_name'] = func.name
-            mock['init_params'] = {inpt.name: self._mockify_input(input_type=inpt.type) for inpt in module.init_inputs}
-            mock['inputs'] = [{'name': inpt.name, 'value': self._mockify_input(input_type=inpt.type)} for inpt in
-                              func.inputs]
+        mock = {'module_name': module.name,
+                'function_name': func.name,
+                'init_params': {inpt.name: self._mockify_input(input_type=inpt.type) for inpt in module.init_inputs},
+                'inputs': [{'name': inpt.name, 'value': self._mockify_input(input_type=inpt.type)}
+                           for inpt in func.inputs]}
 
-        with open(os.path.join(local_path, 'mock.json'), 'w') as f:
+        if local_path is None:
+            local_path = os.getcwd()
+        with open(os.path.join(local_path, assets.paths.MOCK_FILENAME), 'w') as f:
             json.dump(mock, f)
 
     @staticmethod
@@ -6,6 +6,8 @@ from .. import exceptions, entities
 
 logger = logging.getLogger(name='dtlpy')
 
+_VALUE_TYPES = (dict, str, float, int, bool, list)
+
 
 class PackageInputType(str, Enum):
     DATASET = "Dataset"
@@ -44,6 +46,16 @@ class PackageInputType(str, Enum):
     RECIPES = "Recipe[]"
 
 
+_TYPE_TO_NAME = {PackageInputType.ITEM: 'item',
+                 PackageInputType.DATASET: 'dataset',
+                 PackageInputType.ANNOTATION: 'annotation',
+                 PackageInputType.PROJECT: 'project',
+                 PackageInputType.PACKAGE: 'package',
+                 PackageInputType.SERVICE: 'service',
+                 PackageInputType.EXECUTION: 'execution',
+                 PackageInputType.MODEL: 'model'}
+
+
 class PackageFunction(entities.DlEntity):
     """
     Webhook object
@@ -101,24 +113,7 @@ class FunctionIO(entities.DlEntity):
 
     @name.default
     def set_name(self):
-        if self.type == PackageInputType.ITEM:
-            return 'item'
-        elif self.type == PackageInputType.DATASET:
-            return 'dataset'
-        elif self.type == PackageInputType.ANNOTATION:
-            return 'annotation'
-        elif self.type == PackageInputType.PROJECT:
-            return 'project'
-        elif self.type == PackageInputType.PACKAGE:
-            return 'package'
-        elif self.type == PackageInputType.SERVICE:
-            return 'service'
-        elif self.type == PackageInputType.EXECUTION:
-            return 'execution'
-        elif self.type == PackageInputType.MODEL:
-            return 'model'
-        else:
-            return 'config'
+        return _TYPE_TO_NAME.get(self.type, 'config')
 
     @type.validator
     def check_type(self, value):
@@ -138,19 +133,13 @@ class FunctionIO(entities.DlEntity):
 
     @value.validator
     def check_value(self, value):
-        value_ok = True
-        expected_value = 'Expected value should be:'
+        if value is None:
+            return
         if self.type == PackageInputType.JSON:
-            expected_value = '{} json serializable'.format(expected_value)
             if not self.is_json_serializable(value):
-                value_ok = False
-        else:
-            expected_value = 'Unknown value type: {}'.format(type(value))
-            if type(value) not in [dict, str, float, int, bool, list]:
-                value_ok = False
-
-        if not value_ok and value is not None:
-            raise exceptions.PlatformException('400', 'Illegal value. {}'.format(expected_value))
+                raise exceptions.PlatformException('400', 'Illegal value. Expected value should be: json serializable')
+        elif type(value) not in _VALUE_TYPES:
+            raise exceptions.PlatformException('400', 'Illegal value. Unknown value type: {}'.format(type(value)))
 
     def to_json(self, resource='package'):
         """
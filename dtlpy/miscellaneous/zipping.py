@@ -1,14 +1,25 @@
+import collections
 import logging
 import os
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-import numpy as np
 import pathspec
 
 logger = logging.getLogger(name='dtlpy')
 
 MAX_ZIP_FILE = 100e6  # 100MB
+MAX_READ_WORKERS = 8
+MAX_READ_AHEAD = 32  # files held in memory while zipping
+MAX_READ_AHEAD_BYTES = 32 << 20  # 32MB held in memory while zipping
+MAX_PREFETCH_FILE_SIZE = 1 << 20  # 1MB - larger files are streamed by ZipFile.write
+ZIP_WRITE_BUFFER_SIZE = 1 << 20  # 1MB
+
+COMPRESSION_METHODS = {'stored': zipfile.ZIP_STORED,
+                       'deflate': zipfile.ZIP_DEFLATED,
+                       'bzip2': zipfile.ZIP_BZIP2,
+                       'lzma': zipfile.ZIP_LZMA}
 
 
 class Zipping:
@@ -33,30 +44,16 @@ class Zipping:
         # check if directory
         assert os.path.isdir(directory), '[ERROR] Directory does not exists: {}'.format(directory)
 
-        if '.gitignore' in os.listdir(directory):
-            with open(os.path.join(directory, '.gitignore')) as f:
-                spec_src = f.read()
-        else:
-            spec_src = ''
-        ignore_lines = spec_src.splitlines() + ['.git', '.dataloop']
-        if ignore_directories is not None:
-            ignore_lines += ignore_directories
-        spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, ignore_lines)
-
-        # init zip file
-        zip_file = zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED)
-        try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    if not spec.match_file(os.path.relpath(filepath, directory)):
-                        Zipping.__add_to_zip_file(directory, filepath, ignore_max_file_size, zip_file)
-        finally:
-            zip_file.close()
+        filepaths = Zipping.list_files(directory=directory, ignore_directories=ignore_directories)
+        files = Zipping.__check_files_size(filepaths, ignore_max_file_size)
+        # init zip file - buffer the output to coalesce the many small header/data writes
+        with open(zip_filename, 'wb', buffering=ZIP_WRITE_BUFFER_SIZE) as f, \
+                zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            Zipping.__add_files_to_zip_file(directory, files, zip_file)
 
     @staticmethod
     def zip_directory_inclusive(zip_filename, directory=None, ignore_max_file_size=False,
-                                subpaths: List[str] = None):
+                                subpaths: List[str] = None, compression: str = 'deflate', compresslevel: int = None):
         """
         Zip Directory
         Will ignore .gitignore files
@@ -65,33 +62,56 @@ class Zipping:
         :param zip_filename: the name of the zipfile
         :param ignore_max_file_size: ignore the limitation on the zip file size
         :param list[str] subpaths: paths to include in the final zip (relative path).
+        :param str compression: compression method, one of: stored, deflate, bzip2, lzma
+        :param int compresslevel: compression level, None for the method's default (python>=3.7)
         :return: None
         """
+        if compression not in COMPRESSION_METHODS:
+            raise ValueError('Unknown compression: {!r}. Please select from: {}'.format(compression,
+                                                                                     list(COMPRESSION_METHODS)))
         # default path
         if directory is None:
             directory = os.getcwd()
         # check if directory
         assert os.path.isdir(directory), '[ERROR] Directory does not exists: %s' % directory
 
+        filepaths = Zipping.list_files(directory=directory, subpaths=subpaths)
+        files = Zipping.__check_files_size(filepaths, ignore_max_file_size)
+        # init zip file - buffer the output to coalesce the many small header/data writes
+        with open(zip_filename, 'wb', buffering=ZIP_WRITE_BUFFER_SIZE) as f, \
+                zipfile.ZipFile(f, 'w', COMPRESSION_METHODS[compression]) as zip_file:
+            Zipping.__add_files_to_zip_file(directory, files, zip_file, compresslevel=compresslevel)
+
+    @staticmethod
+    def list_files(directory, ignore_directories: List[str] = None, subpaths: List[str] = None) -> List[str]:
+        """
+        List the files that are zipped from a directory.
+        Will ignore .gitignore files, .git and .dataloop
+
+        :param directory: the directory to list
+        :param list[str] ignore_directories: directories to ignore.
+        :param list[str] subpaths: only list files under these paths (relative path).
+        :return: list of file paths
+        """
         if '.gitignore' in os.listdir(directory):
             with open(os.path.join(directory, '.gitignore')) as f:
                 spec_src = f.read()
         else:
             spec_src = ''
         ignore_lines = spec_src.splitlines() + ['.git', '.dataloop']
+        if ignore_directories is not None:
+            ignore_lines += ignore_directories
         spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, ignore_lines)
 
-        # init zip file
-        zip_file = zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED)
-        try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    if not spec.match_file(os.path.relpath(filepath, directory)) \
-                            and Zipping.__check_filepath(os.path.relpath(filepath, directory), subpaths):
-                        Zipping.__add_to_zip_file(directory, filepath, ignore_max_file_size, zip_file)
-        finally:
-            zip_file.close()
+        filepaths = list()
+        for root, dirs, files in os.walk(directory):
+            for file in files:
+                filepath = os.path.join(root, file)
+                relpath = os.path.relpath(filepath, directory)
+                if not spec.match_file(relpath) \
+                        and (subpaths is None or Zipping.__check_filepath(relpath, subpaths)):
+                    filepaths.append(filepath)
+        return filepaths
 
     @staticmethod
     def __check_filepath(filepath: str, paths: List[str]):
@@ -101,15 +121,66 @@ class Zipping:
         return any(filepath.startswith(directory) for directory in paths)
 
     @staticmethod
-    def __add_to_zip_file(directory, filepath, ignore_max_file_size, zip_file):
-        zip_file.write(filepath, arcname=os.path.relpath(filepath, directory))
-        if not ignore_max_file_size:
-            if np.sum([f.file_size for f in list(zip_file.NameToInfo.values())]) > MAX_ZIP_FILE:
+    def __read_file(filepath):
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    @staticmethod
+    def __read_ahead(pool, files):
+        """
+        Yield (filepath, content) in order while the next small files are being read in the pool.
+        content is None for files over MAX_PREFETCH_FILE_SIZE, those should be streamed from disk
+        """
+        pending = collections.deque()
+        pending_bytes = 0
+        for filepath, size in files:
+            if size > MAX_PREFETCH_FILE_SIZE:
+                pending.append((filepath, 0, None))
+            else:
+                pending.append((filepath, size, pool.submit(Zipping.__read_file, filepath)))
+                pending_bytes += size
+            while len(pending) >= MAX_READ_AHEAD or pending_bytes >= MAX_READ_AHEAD_BYTES:
+                filepath, size, future = pending.popleft()
+                pending_bytes -= size
+                yield filepath, None if future is None else future.result()
+        while pending:
+            filepath, size, future = pending.popleft()
+            yield filepath, None if future is None else future.result()
+
+    @staticmethod
+    def __check_files_size(filepaths, ignore_max_file_size):
+        """
+        Stat the files and raise before anything is read if the total is over MAX_ZIP_FILE
+
+        :return: list of (filepath, size)
+        """
+        files = list()
+        total_size = 0
+        for filepath in filepaths:
+            size = os.stat(filepath).st_size
+            total_size += size
+            if not ignore_max_file_size and total_size > MAX_ZIP_FILE:
                 logger.error('Failed zipping in file: {}'.format(filepath))
                 raise ValueError(
                     'Zip file cant be over 100MB. '
                     'Please verify that only code is being uploaded or '
                     'add files to .gitignore so they wont be zipped and uploaded as code.')
+            files.append((filepath, size))
+        return files
+
+    @staticmethod
+    def __add_files_to_zip_file(directory, files, zip_file, compresslevel=None):
+        # only pass the level when set - write/writestr's compresslevel requires python>=3.7
+        write_kwargs = dict() if compresslevel is None else {'compresslevel': compresslevel}
+        with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as pool:
+            for filepath, data in Zipping.__read_ahead(pool, files):
+                arcname = os.path.relpath(filepath, directory)
+                if data is None:
+                    zip_file.write(filepath, arcname=arcname, **write_kwargs)
+                else:
+                    zinfo = zipfile.ZipInfo.from_file(filepath, arcname=arcname)
+                    zinfo.compress_type = zip_file.compression
+                    zip_file.writestr(zinfo, data, **write_kwargs)
 
     @staticmethod
     def unzip_directory(zip_filename, to_directory=None):
@@ -1,18 +1,34 @@
+import collections
+import copy
+import functools
+import hashlib
 import json
 import logging
 import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from .. import exceptions, entities, services, miscellaneous, assets
 
 logger = logging.getLogger(name='dtlpy')
 
+DPK_CACHE_TTL = 60  # seconds
+DPK_CACHE_MAXSIZE = 256
+LAST_PACK_FILENAME = 'last_pack.json'
+PUBLISH_IGNORE_DIRECTORIES = ['artifacts']
+
+# shared by every Dpks repository so a publish/delete through one instance is seen by all of them
+_dpks_cache = collections.OrderedDict()
+_dpks_cache_lock = threading.Lock()
+
 
 class Dpks:
     def __init__(self, client_api: services.ApiClient, project: entities.Project = None):
         self._client_api = client_api
         self._project = project
-        self._revisions = None
 
     @property
     def project(self) -> Optional[entities.Project]:
@@ -25,7 +41,7 @@ class Dpks:
         self._project = project
 
     def init(self, directory: str = None, name: str = None, description: str = None,
-             categories: List[str] = None, icon: str = None, scope: str = None):
+             categories: List[str] = None, icon: str = None, scope: str = None, pretty: bool = True):
         """
         Initialize a dpk project with the specified projects.
 
@@ -35,6 +51,7 @@ class Dpks:
         :param str categories: the categories of the dpk.
         :param str icon: the icon of the dpk.
         :param str scope: the scope of the dpk.
+        :param bool pretty: write an indented app json. if False - write the compact form
 
         ** Example **
         .. code-block:: python
@@ -43,27 +60,35 @@ class Dpks:
         """
         if directory is None:
             directory = os.getcwd()
-        dpk = entities.Dpk.from_json(_json={'name': miscellaneous.JsonUtils.get_if_absent(name),
-                                            'description': miscellaneous.JsonUtils.get_if_absent(description),
-                                            'categories': miscellaneous.JsonUtils.get_if_absent(categories),
-                                            'icon': miscellaneous.JsonUtils.get_if_absent(icon),
-                                            'scope': miscellaneous.JsonUtils.get_if_absent(scope, 'organization'),
+        # keep absent fields as empty strings so the generated app json lists every key to fill in
+        dpk = entities.Dpk.from_json(_json={'name': name if name is not None else '',
+                                            'description': description if description is not None else '',
+                                            'categories': categories if categories is not None else '',
+                                            'icon': icon if icon is not None else '',
+                                            'scope': scope if scope is not None else 'organization',
                                             'components': dict()
                                             },
                                      client_api=self._client_api)
         dataloop_filepath = os.path.join(directory, assets.paths.APP_JSON_FILENAME)
+        if pretty:
+            app_json = json.dumps(dpk.to_json(), indent=4)
+        else:
+            app_json = json.dumps(dpk.to_json(), separators=(',', ':'))
         with open(dataloop_filepath, 'w') as json_file:
-            json_file.write(json.dumps(dpk.to_json(), indent=4))
+            json_file.write(app_json)
         os.makedirs(os.path.join(directory, 'functions'), exist_ok=True)
         os.makedirs(os.path.join(directory, 'panels'), exist_ok=True)
 
     # noinspection PyMethodMayBeStatic
-    def pack(self, directory: str = None, name: str = None, subpaths_to_append: List[str] = None) -> str:
+    def pack(self, directory: str = None, name: str = None, subpaths_to_append: List[str] = None,
+             compression: str = 'deflate', compresslevel: int = None) -> str:
         """
         :param str directory: optional - the project to pack, if not specified use the current project,
         :param str name: optional - the name of the dpk file.
         :param List[str] subpaths_to_append: optional - the files/directories to add to the dpk file.
                                             (along with functions, panels and dataloop.json)
+        :param str compression: optional - zip compression method: stored, deflate, bzip2 or lzma. default: deflate
+        :param int compresslevel: optional - compression level (e.g. 1 for fastest deflate). default: method's default
         :return the path of the dpk file
 
         **Example**
@@ -72,10 +97,10 @@ class Dpks:
             filepath = dl.apps.pack(directory='/my-current-project', name='project-name')
         """
         # create/get .dataloop dir
+        app_filename = assets.paths.APP_JSON_FILENAME
         cwd = os.getcwd()
         dl_dir = os.path.join(cwd, '.dataloop')
-        if not os.path.isdir(dl_dir):
-            os.mkdir(dl_dir)
+        os.makedirs(dl_dir, exist_ok=True)
         if directory is None:
             directory = cwd
 
@@ -83,8 +108,13 @@ class Dpks:
         if name is None:
             name = os.path.basename(directory)
 
-        with open(os.path.join(directory, 'dataloop.json'), 'r') as file:
-            app_json = json.load(file)
+        try:
+            app_json = json.loads(pathlib.Path(directory, app_filename).read_bytes())
+        except OSError:
+            # only check the directory when the app json cannot be read
+            if not os.path.isdir(directory):
+                raise ValueError('Not a directory: {}'.format(directory))
+            raise
         version = app_json.get('version', None)
         if version is None:
             logger.warning('No Version specified, setting to 1.0.0')
@@ -92,8 +122,6 @@ class Dpks:
         # create/get dist folder
         dpk_filename = os.path.join(dl_dir, '{}_{}.dpk'.format(name, version))
 
-        if not os.path.isdir(directory):
-            raise ValueError('Not a directory: {}'.format(directory))
         if subpaths_to_append is None:
             subpaths_to_append = []
 
@@ -104,7 +132,9 @@ class Dpks:
                                                           directory=directory,
                                                           subpaths=['functions',
                                                                     'panels',
-                                                                    'dataloop.json'] + subpaths_to_append
+                                                                    app_filename] + subpaths_to_append,
+                                                          compression=compression,
+                                                          compresslevel=compresslevel
                                                           )
             return dpk_filename
         except Exception:
@@ -155,11 +185,18 @@ class Dpks:
         dpk.codebases.unpack(codebase=dpk.codebase, local_path=local_path)
         return local_path
 
-    def __get_by_name(self, dpk_name: str):
+    def __get_by_name(self, dpk_name: str, use_cache: bool):
+        _json = self._cache_get(('name', dpk_name)) if use_cache else None
+        if _json is not None:
+            return entities.Dpk.from_json(_json=_json,
+                                          client_api=self._client_api,
+                                          project=self._project)
+        # items_count is the total match count, so a single item page is enough to detect duplicates
         filters = entities.Filters(field='name',
                                    values=dpk_name,
                                    resource=entities.FiltersResource.DPK,
-                                   use_defaults=False)
+                                   use_defaults=False,
+                                   page_size=1)
         dpks = self.list(filters=filters)
         if dpks.items_count == 0:
             raise exceptions.PlatformException(
@@ -169,7 +206,10 @@ class Dpks:
             raise exceptions.PlatformException(
                 error='400',
                 message='More than one dpk found by the name of: {}'.format(dpk_name))
-        return dpks.items[0]
+        dpk = dpks.items[0]
+        if use_cache:
+            self._cache_set(('name', dpk_name), dpk.to_json())
+        return dpk
 
     def publish(self, dpk: entities.Dpk = None) -> entities.Dpk:
         """
@@ -186,28 +226,100 @@ class Dpks:
         """
 
         if dpk is None:
-            if not os.path.exists(os.path.abspath('dataloop.json')):
-                raise ValueError('dataloop.json file must be exists in order to publish a dpk')
-            with open('dataloop.json', 'r') as f:
-                json_file = json.load(f)
+            if not os.path.exists(os.path.abspath(assets.paths.APP_JSON_FILENAME)):
+                raise ValueError('{} file must be exists in order to publish a dpk'.format(
+                    assets.paths.APP_JSON_FILENAME))
+            json_file = json.loads(pathlib.Path(assets.paths.APP_JSON_FILENAME).read_bytes())
             dpk = entities.Dpk.from_json(_json=json_file,
                                          client_api=self._client_api,
                                          project=self.project)
 
+        last_pack = None
         if dpk.codebase is None:
-            dpk.codebase = self.project.codebases.pack(directory=os.getcwd(),
-                                                       name=dpk.display_name,
-                                                       extension='dpk',
-                                                       ignore_directories=['artifacts'])
+            directory = os.getcwd()
+            last_pack_filepath = os.path.join(directory, '.dataloop', LAST_PACK_FILENAME)
+            last_pack = {'fingerprint': self._directory_fingerprint(directory=directory),
+                         'projectId': self.project.id,
+                         'name': dpk.display_name}
+            codebase = self._load_last_pack(filepath=last_pack_filepath, last_pack=last_pack)
+            if codebase is not None and not self._codebase_exists(codebase=codebase):
+                logger.info('Codebase of the last pack no longer exists, packing again: {}'.format(codebase))
+                codebase = None
+            if codebase is None:
+                dpk.codebase = self.project.codebases.pack(directory=directory,
+                                                           name=dpk.display_name,
+                                                           extension='dpk',
+                                                           ignore_directories=PUBLISH_IGNORE_DIRECTORIES)
+                last_pack['codebase'] = dpk.to_json()['codebase']
+                self._save_last_pack(filepath=last_pack_filepath, last_pack=last_pack)
+            else:
+                logger.info('Source code did not change since the last pack, using codebase: {}'.format(codebase))
+                dpk.codebase = codebase
 
         success_pack, response_pack = self._client_api.gen_request(req_type='post',
                                                                    json_req=dpk.to_json(),
                                                                    path='/app-registry')
         if not success_pack:
+            if last_pack is not None:
+                # the cached codebase might be the cause - pack again next time
+                self._save_last_pack(filepath=last_pack_filepath, last_pack=None)
             raise exceptions.PlatformException(error=response_pack)
+        self.invalidate(dpk_name=dpk.name)
 
         return entities.Dpk.from_json(response_pack.json(), self._client_api, dpk.project)
 
+    @staticmethod
+    def _directory_fingerprint(directory: str) -> str:
+        """
+        Hash of the relative path, size and modification time of every file publish packs from the directory
+        """
+        entries = list()
+        for filepath in miscellaneous.Zipping.list_files(directory=directory,
+                                                        ignore_directories=PUBLISH_IGNORE_DIRECTORIES):
+            stat = os.stat(filepath)
+            entries.append('{}:{}:{}'.format(os.path.relpath(filepath, directory),
+                                             stat.st_size,
+                                             stat.st_mtime_ns))
+        entries.sort()
+        return hashlib.md5('\n'.join(entries).encode('utf-8')).hexdigest()
+
+    def _codebase_exists(self, codebase: dict) -> bool:
+        """
+        Check that the item of a codebase json is still on the platform
+        """
+        item_id = codebase.get('itemId', None) if isinstance(codebase, dict) else None
+        if item_id is None:
+            return False
+        success, _ = self._client_api.gen_request(req_type='get',
+                                                  path='/items/{}'.format(item_id))
+        return success
+
+    @staticmethod
+    def _load_last_pack(filepath: str, last_pack: dict):
+        """
+        Return the codebase json of the last pack if it was done on the same sources, otherwise None
+        """
+        try:
+            _json = json.loads(pathlib.Path(filepath).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(_json, dict) or any(_json.get(key) != value for key, value in last_pack.items()):
+            return None
+        return _json.get('codebase', None)
+
+    @staticmethod
+    def _save_last_pack(filepath: str, last_pack: Optional[dict]):
+        try:
+            if last_pack is None:
+                if os.path.isfile(filepath):
+                    os.remove(filepath)
+            else:
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                with open(filepath, 'w') as f:
+                    f.write(json.dumps(last_pack))
+        except OSError:
+            logger.debug('Failed to update last pack file: {}'.format(filepath))
+
     def delete(self, dpk_id: str) -> bool:
         """
         Delete the dpk from the app store.
@@ -220,6 +332,7 @@ class Dpks:
         """
         success, response = self._client_api.gen_request(req_type='delete', path=f'/app-registry/{dpk_id}')
         if success:
+            self.invalidate()
             logger.info('Deleted dpk successfully')
         else:
             raise exceptions.PlatformException(response)
@@ -239,7 +352,6 @@ class Dpks:
         """
         if dpk_name is None:
             raise ValueError('You must provide dpk_name')
-        self._revisions = dpk_name
         if filters is None:
             filters = entities.Filters(resource=entities.FiltersResource.DPK)
         elif not isinstance(filters, entities.Filters):
@@ -247,23 +359,69 @@ class Dpks:
         elif filters.resource != entities.FiltersResource.DPK:
             raise TypeError('Filters resource must to be FiltersResource.DPK. Got: {!r}'.format(filters.resource))
 
-        success, response = self._client_api.gen_request(req_type='post',
-                                                         path="/app-registry/{}/revisions".format(dpk_name))
-        if not success:
-            raise exceptions.PlatformException(response)
-
         paged = entities.PagedEntities(items_repository=self,
                                        filters=filters,
                                        page_offset=filters.page,
                                        page_size=filters.page_size,
                                        client_api=self._client_api,
-                                       list_function=self._list_revisions)
+                                       list_function=functools.partial(self._list_revisions, dpk_name=dpk_name))
         paged.get_page()
         return paged
 
-    def _list_revisions(self, filters: entities.Filters):
-        url = '/app-registry/{}/revisions'.format(self._revisions)
-        self._revisions = None
+    def delete_many(self, dpk_ids: List[str], max_workers: int = 8) -> List[bool]:
+        """
+        Delete several dpks from the app store concurrently.
+        A failed delete does not stop the others, it is logged and returned as False.
+
+        :param List[str] dpk_ids: the ids of the dpks to delete.
+        :param int max_workers: maximum number of concurrent requests.
+        :return whether each operation ran successfully, in the order of dpk_ids
+        :rtype List[bool]
+
+        ** Example **
+        ..code-block:: python
+            dl.dpks.delete_many(dpk_ids=['id1', 'id2'])
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(functools.partial(self._protected_call, self.delete), dpk_ids))
+        for dpk_id, (success, result) in zip(dpk_ids, results):
+            if not success:
+                logger.warning('Failed to delete dpk: {}. {}'.format(dpk_id, result))
+        return [success for success, _ in results]
+
+    def revisions_many(self, dpk_names: List[str],
+                       max_workers: int = 8) -> List[Optional[entities.PagedEntities]]:
+        """
+        Get the available versions of several dpks concurrently.
+        A failed request does not stop the others, it is logged and returned as None.
+
+        :param List[str] dpk_names: the names of the dpks.
+        :param int max_workers: maximum number of concurrent requests.
+        :return the first page of revisions for each dpk (None if failed), in the order of dpk_names
+
+        ** Example **
+        ..code-block:: python
+            versions = dl.dpks.revisions_many(dpk_names=['name1', 'name2'])
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(functools.partial(self._protected_call, self.revisions), dpk_names))
+        for dpk_name, (success, result) in zip(dpk_names, results):
+            if not success:
+                logger.warning('Failed to get dpk revisions: {}. {}'.format(dpk_name, result))
+        return [result if success else None for success, result in results]
+
+    @staticmethod
+    def _protected_call(func, *args):
+        """
+        Call func and return (True, result) or (False, the raised exception)
+        """
+        try:
+            return True, func(*args)
+        except Exception as e:
+            return False, e
+
+    def _list_revisions(self, filters: entities.Filters, dpk_name: str):
+        url = '/app-registry/{}/revisions'.format(dpk_name)
         # request
         success, response = self._client_api.gen_request(req_type='post',
                                                          path=url,
@@ -309,7 +467,53 @@ class Dpks:
             raise exceptions.PlatformException(response)
         return response.json()
 
-    def get(self, dpk_name: str = None, dpk_id: str = None) -> entities.Dpk:
+    def _cache_key(self, key):
+        return (self._client_api.environment,) + key
+
+    def _cache_get(self, key):
+        key = self._cache_key(key)
+        with _dpks_cache_lock:
+            entry = _dpks_cache.get(key, None)
+            if entry is None:
+                return None
+            timestamp, _json = entry
+            if time.monotonic() - timestamp > DPK_CACHE_TTL:
+                _dpks_cache.pop(key, None)
+                return None
+        return copy.deepcopy(_json)
+
+    def _cache_set(self, key, _json):
+        key = self._cache_key(key)
+        now = time.monotonic()
+        entry = (now, copy.deepcopy(_json))
+        with _dpks_cache_lock:
+            _dpks_cache[key] = entry
+            _dpks_cache.move_to_end(key)
+            # entries are ordered by insertion time - drop the expired ones and the oldest above the max size
+            while _dpks_cache:
+                oldest_key, (timestamp, _) = next(iter(_dpks_cache.items()))
+                if len(_dpks_cache) <= DPK_CACHE_MAXSIZE and now - timestamp <= DPK_CACHE_TTL:
+                    break
+                _dpks_cache.pop(oldest_key)
+
+    def invalidate(self, dpk_id: str = None, dpk_name: str = None):
+        """
+        Remove dpks from the get() cache. If no identifier is given the whole cache is cleared.
+        The cache is shared by all the Dpks repositories.
+
+        :param str dpk_id: the id of the dpk to remove.
+        :param str dpk_name: the name of the dpk to remove.
+        """
+        with _dpks_cache_lock:
+            if dpk_id is None and dpk_name is None:
+                _dpks_cache.clear()
+                return
+            if dpk_id is not None:
+                _dpks_cache.pop(self._cache_key(('id', dpk_id)), None)
+            if dpk_name is not None:
+                _dpks_cache.pop(self._cache_key(('name', dpk_name)), None)
+
+    def get(self, dpk_name: str = None, dpk_id: str = None, use_cache: bool = False) -> entities.Dpk:
         """
         Get a specific dpk from the platform.
 
@@ -317,6 +521,7 @@ class Dpks:
 
         :param str dpk_id: the id of the dpk to get.
         :param str dpk_name: the name of the dpk to get.
+        :param bool use_cache: return a copy fetched in the last DPK_CACHE_TTL seconds if there is one
         :return the entity of the dpk
         :rtype entities.Dpk
 
@@ -327,19 +532,24 @@ class Dpks:
         if dpk_id is None and dpk_name is None:
             raise ValueError('You must provide an identifier, either dpk_id or dpk_name')
         if dpk_id is not None:
-            url = '/app-registry/{}'.format(dpk_id)
-
-            # request
-            success, response = self._client_api.gen_request(req_type='get',
-                                                             path=url)
-            if not success:
-                raise exceptions.PlatformException(response)
-
-            dpk = entities.Dpk.from_json(_json=response.json(),
+            _json = self._cache_get(('id', dpk_id)) if use_cache else None
+            if _json is None:
+                url = '/app-registry/{}'.format(dpk_id)
+
+                # request
+                success, response = self._client_api.gen_request(req_type='get',
+                                                                 path=url)
+                if not success:
+                    raise exceptions.PlatformException(response)
+                _json = response.json()
+                if use_cache:
+                    self._cache_set(('id', dpk_id), _json)
+
+            dpk = entities.Dpk.from_json(_json=_json,
                                          client_api=self._client_api,
                                          project=self._project,
                                          is_fetched=False)
         else:
-            dpk = self.__get_by_name(dpk_name)
+            dpk = self.__get_by_name(dpk_name, use_cache=use_cache)
 
         return dpk
@@ -0,0 +1,46 @@
+Feature: Dpks get cache
+
+    Background:
+        Given A platform with the dpks "dpk-1, dpk-2, dpk-3"
+
+    Scenario: Get a dpk from the cache
+        When I get the dpk "dpk-1" with the cache
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 1 times
+
+    Scenario: Get a dpk without the cache
+        When I get the dpk "dpk-1" without the cache
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 2 times
+
+    Scenario: Get a dpk after invalidating the cache
+        When I get the dpk "dpk-1" with the cache
+        And I invalidate the dpks cache
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 2 times
+
+    Scenario: Get a dpk after it was deleted through another repository
+        When I get the dpk "dpk-1" with the cache
+        And I delete the dpk "dpk-1" through another repository
+        And I get the dpk "dpk-1" with the cache
+        Then I should get an exception error='404'
+
+    Scenario: Get a dpk after the cache expired
+        When I get the dpk "dpk-1" with the cache
+        And The dpks cache expires
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 2 times
+
+    Scenario: Get a dpk evicted from a full cache
+        Given The dpks cache max size is 2
+        When I get the dpk "dpk-1" with the cache
+        And I get the dpk "dpk-2" with the cache
+        And I get the dpk "dpk-3" with the cache
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 4 times
+
+    Scenario: Get a dpk cached in another environment
+        When I get the dpk "dpk-1" with the cache
+        And I switch the dpks environment
+        And I get the dpk "dpk-1" with the cache
+        Then The dpks platform should have been requested 2 times
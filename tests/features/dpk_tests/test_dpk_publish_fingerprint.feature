@@ -0,0 +1,43 @@
+Feature: Skip packing a dpk when the sources did not change
+
+    Background:
+        Given I have a dpk source directory
+
+    Scenario: Fingerprint of unchanged sources
+        When I compute the dpk source fingerprint
+        And I compute the dpk source fingerprint again
+        Then The dpk source fingerprint should not change
+
+    Scenario: Fingerprint after a packed file changes
+        When I compute the dpk source fingerprint
+        And I write "print('changed')" to "main.py" in the dpk source directory
+        And I compute the dpk source fingerprint again
+        Then The dpk source fingerprint should change
+
+    Scenario: Fingerprint after ignored files change
+        When I compute the dpk source fingerprint
+        And I write "log line" to "run.log" in the dpk source directory
+        And I write "weights" to "artifacts/model.bin" in the dpk source directory
+        And I compute the dpk source fingerprint again
+        Then The dpk source fingerprint should not change
+
+    Scenario: Publish reuses the codebase of the last pack
+        Given There is a last pack record for the dpk source directory
+        When I publish the dpk from the dpk source directory
+        Then The dpk should be published with the codebase item "item-id"
+        And The dpk source directory should have been packed 0 times
+
+    Scenario: Publish packs again when the codebase of the last pack was deleted
+        Given There is a last pack record for the dpk source directory
+        And The codebase item "item-id" was deleted from the platform
+        When I publish the dpk from the dpk source directory
+        Then The dpk should be published with the codebase item "packed-item-id"
+        And The dpk source directory should have been packed 1 times
+        And The last pack record should have the codebase item "packed-item-id"
+
+    Scenario: Last pack record is removed after a failed publish
+        Given There is a last pack record for the dpk source directory
+        And The platform rejects dpk publish
+        When I publish the dpk from the dpk source directory
+        Then I should get an exception error='400'
+        And The last pack record should not exist
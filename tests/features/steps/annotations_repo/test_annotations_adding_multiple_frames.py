@@ -1,4 +1,5 @@
 import behave
+import numpy as np
 from time import sleep
 
 
@@ -9,15 +10,17 @@ def step_impl(context, number_of_annotations):
     context.item = context.dl.items.get(item_id=context.item.id)
 
     builder = context.item.annotations.builder()
+    box = context.dl.Box
+    add = builder.add
     for i in range(int(number_of_annotations)):
-        builder.add(annotation_definition=context.dl.Box(left=50 + i * 15,
-                                                         top=50 + i * 15,
-                                                         right=250 + i * 15,
-                                                         bottom=250 + i * 15,
-                                                         label='label1'),
-                    object_visible=True,
-                    object_id=0,
-                    frame_num=i + 10 * i)
+        add(annotation_definition=box(left=50 + i * 15,
+                                      top=50 + i * 15,
+                                      right=250 + i * 15,
+                                      bottom=250 + i * 15,
+                                      label='label1'),
+            object_visible=True,
+            object_id=0,
+            frame_num=i + 10 * i)
     context.item.annotations.upload(builder)
 
 
@@ -25,15 +28,16 @@ def step_impl(context, number_of_annotations):
 def step_impl(context, number_of_keyframes):
     frames = context.item.annotations.list()[0].frames
 
-    for i in range(int(number_of_keyframes)):
-        current_frame = frames[i + 10 * i]
-
-        left = current_frame.coordinates[0]['x']
-        top = current_frame.coordinates[0]['y']
-        right = current_frame.coordinates[1]['x']
-        bottom = current_frame.coordinates[1]['y']
-
-        assert left == 50 + i * 15
-        assert top == 50 + i * 15
-        assert right == 250 + i * 15
-        assert bottom == 250 + i * 15
+    keyframes = np.arange(int(number_of_keyframes))
+    offsets = keyframes * 15
+    expected = np.stack([50 + offsets, 50 + offsets, 250 + offsets, 250 + offsets], axis=1)
+    coordinates = list()
+    for frame_num in keyframes * 11:
+        current_frame = frames[int(frame_num)]
+        coordinates.append([current_frame.coordinates[0]['x'],
+                            current_frame.coordinates[0]['y'],
+                            current_frame.coordinates[1]['x'],
+                            current_frame.coordinates[1]['y']])
+
+    assert np.array_equal(np.array(coordinates), expected), \
+        'Keyframes coordinates mismatch. Expected: {}, Got: {}'.format(expected.tolist(), coordinates)
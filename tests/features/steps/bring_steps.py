@@ -193,7 +193,7 @@ from tests.features.steps.items_repo import test_upload_and_download_images
 from tests.features.steps.annotations_repo import test_rotated_box_points
 from tests.features.steps.app_entity import test_app_install, test_app_uninstall, test_app_update, test_app_get
 from tests.features.steps.dpk_tests import dpk_json_to_object, test_dpk_publish, test_dpk_list,\
-    test_dpk_pull, test_dpk_get
+    test_dpk_pull, test_dpk_get, test_dpk_publish_fingerprint, test_dpk_get_cache
 
 from tests.features.steps.webm_converter import test_failed_video_message
 
@@ -0,0 +1,90 @@
+import json
+from unittest import mock
+
+import behave
+import requests
+import dtlpy as dl
+from dtlpy.repositories import dpks as dpks_repo
+
+
+def _response(status_code, _json):
+    response = requests.models.Response()
+    response.status_code = status_code
+    response._content = json.dumps(_json).encode('utf-8')
+    return response
+
+
+def _start_patch(context, patcher):
+    patcher.start()
+    context.add_cleanup(patcher.stop)
+
+
+@behave.given(u'A platform with the dpks "{dpk_ids}"')
+def step_impl(context, dpk_ids):
+    context.platform_dpks = {dpk_id: {'id': dpk_id, 'name': dpk_id} for dpk_id in dpk_ids.split(', ')}
+    context.platform_get_calls = 0
+
+    def gen_request(req_type, path, **kwargs):
+        dpk_id = path.split('/')[-1]
+        if req_type == 'get':
+            context.platform_get_calls += 1
+            if dpk_id not in context.platform_dpks:
+                return False, _response(404, {'message': 'Dpk not found'})
+            return True, _response(200, context.platform_dpks[dpk_id])
+        if req_type == 'delete':
+            context.platform_dpks.pop(dpk_id, None)
+            return True, _response(200, {})
+        raise AssertionError('Unexpected request: {} {}'.format(req_type, path))
+
+    _start_patch(context, mock.patch.object(dl.client_api, 'gen_request', side_effect=gen_request))
+    context.dpks = dl.repositories.Dpks(client_api=dl.client_api)
+    # the cache is shared by all the repositories - start and end every scenario with an empty one
+    context.dpks.invalidate()
+    context.add_cleanup(context.dpks.invalidate)
+
+
+@behave.given(u'The dpks cache max size is {max_size:d}')
+def step_impl(context, max_size):
+    _start_patch(context, mock.patch.object(dpks_repo, 'DPK_CACHE_MAXSIZE', max_size))
+
+
+@behave.when(u'I get the dpk "{dpk_id}" with the cache')
+def step_impl(context, dpk_id):
+    context.e = None
+    try:
+        context.dpk = context.dpks.get(dpk_id=dpk_id, use_cache=True)
+    except dl.exceptions.NotFound as e:
+        context.e = e
+
+
+@behave.when(u'I get the dpk "{dpk_id}" without the cache')
+def step_impl(context, dpk_id):
+    context.dpk = context.dpks.get(dpk_id=dpk_id)
+
+
+@behave.when(u'I invalidate the dpks cache')
+def step_impl(context):
+    context.dpks.invalidate(dpk_id=context.dpk.id)
+
+
+@behave.when(u'I delete the dpk "{dpk_id}" through another repository')
+def step_impl(context, dpk_id):
+    dl.repositories.Dpks(client_api=dl.client_api).delete(dpk_id=dpk_id)
+
+
+@behave.when(u'The dpks cache expires')
+def step_impl(context):
+    _start_patch(context, mock.patch.object(dpks_repo, 'DPK_CACHE_TTL', -1))
+
+
+@behave.when(u'I switch the dpks environment')
+def step_impl(context):
+    _start_patch(context, mock.patch.object(type(dl.client_api), 'environment',
+                                            new_callable=mock.PropertyMock,
+                                            return_value='https://other-gate.dataloop.ai/api/v1'))
+
+
+@behave.then(u'The dpks platform should have been requested {count:d} times')
+def step_impl(context, count):
+    assert context.platform_get_calls == count, \
+        'Expected {} requests, got {}'.format(count, context.platform_get_calls)
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import behave
+import requests
+import dtlpy as dl
+from dtlpy.repositories import dpks as dpks_repo
+
+
+def _response(status_code, _json):
+    response = requests.models.Response()
+    response.status_code = status_code
+    response._content = json.dumps(_json).encode('utf-8')
+    return response
+
+
+@behave.given(u'I have a dpk source directory')
+def step_impl(context):
+    context.source_dir = tempfile.mkdtemp()
+    context.add_cleanup(shutil.rmtree, context.source_dir, True)
+    files = {'.gitignore': '*.log\n',
+             'main.py': "print('hello')\n",
+             os.path.join('artifacts', 'model.bin'): 'weights'}
+    for filepath, content in files.items():
+        filepath = os.path.join(context.source_dir, filepath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w') as f:
+            f.write(content)
+    context.last_pack_filepath = os.path.join(context.source_dir, '.dataloop', dpks_repo.LAST_PACK_FILENAME)
+
+
+@behave.when(u'I compute the dpk source fingerprint')
+def step_impl(context):
+    context.fingerprint = dl.repositories.Dpks._directory_fingerprint(directory=context.source_dir)
+
+
+@behave.when(u'I compute the dpk source fingerprint again')
+def step_impl(context):
+    context.new_fingerprint = dl.repositories.Dpks._directory_fingerprint(directory=context.source_dir)
+
+
+@behave.when(u'I write "{content}" to "{filename}" in the dpk source directory')
+def step_impl(context, content, filename):
+    filepath = os.path.join(context.source_dir, filename)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'a') as f:
+        f.write(content)
+
+
+@behave.then(u'The dpk source fingerprint should not change')
+def step_impl(context):
+    assert context.fingerprint == context.new_fingerprint
+
+
+@behave.then(u'The dpk source fingerprint should change')
+def step_impl(context):
+    assert context.fingerprint != context.new_fingerprint
+
+
+@behave.given(u'There is a last pack record for the dpk source directory')
+def step_impl(context):
+    context.project = dl.entities.Project.from_json(_json={'id': 'project-id', 'name': 'project'},
+                                                    client_api=dl.client_api)
+    context.dpk = dl.entities.Dpk.from_json(_json={'name': 'fingerprint-dpk', 'displayName': 'fingerprint-dpk'},
+                                            client_api=dl.client_api,
+                                            project=context.project)
+    # a record of the same sources - publish reuses its codebase instead of packing
+    dl.repositories.Dpks._save_last_pack(filepath=context.last_pack_filepath,
+                                         last_pack={'fingerprint': dl.repositories.Dpks._directory_fingerprint(
+                                             directory=context.source_dir),
+                                             'projectId': context.project.id,
+                                             'name': context.dpk.display_name,
+                                             'codebase': {'type': 'item', 'itemId': 'item-id'}})
+    assert os.path.isfile(context.last_pack_filepath)
+    context.deleted_item_ids = set()
+    context.publish_rejected = False
+
+
+@behave.given(u'The codebase item "{item_id}" was deleted from the platform')
+def step_impl(context, item_id):
+    context.deleted_item_ids.add(item_id)
+
+
+@behave.given(u'The platform rejects dpk publish')
+def step_impl(context):
+    context.publish_rejected = True
+
+
+@behave.when(u'I publish the dpk from the dpk source directory')
+def step_impl(context):
+    def gen_request(req_type, path, json_req=None, **kwargs):
+        if req_type == 'get' and path.startswith('/items/'):
+            if path.split('/')[-1] in context.deleted_item_ids:
+                return False, _response(404, {'message': 'Item not found'})
+            return True, _response(200, {'id': path.split('/')[-1]})
+        if req_type == 'post' and path == '/app-registry':
+            if context.publish_rejected:
+                return False, _response(400, {'message': 'rejected'})
+            return True, _response(200, dict(json_req, id='dpk-id'))
+        raise AssertionError('Unexpected request: {} {}'.format(req_type, path))
+
+    dpks = dl.repositories.Dpks(client_api=dl.client_api, project=context.project)
+    cwd = os.getcwd()
+    os.chdir(context.source_dir)
+    context.e = None
+    try:
+        with mock.patch.object(dl.client_api, 'gen_request', side_effect=gen_request), \
+                mock.patch.object(dl.repositories.Codebases, 'pack',
+                                  return_value={'type': 'item', 'itemId': 'packed-item-id'}) as pack:
+            context.published_dpk = dpks.publish(dpk=context.dpk)
+    except dl.exceptions.BadRequest as e:
+        context.e = e
+    finally:
+        os.chdir(cwd)
+    context.pack_calls = pack.call_count
+
+
+@behave.then(u'The dpk should be published with the codebase item "{item_id}"')
+def step_impl(context, item_id):
+    assert context.published_dpk.to_json()['codebase']['itemId'] == item_id
+
+
+@behave.then(u'The dpk source directory should have been packed {count:d} times')
+def step_impl(context, count):
+    assert context.pack_calls == count, 'Expected {} packs, got {}'.format(count, context.pack_calls)
+
+
+@behave.then(u'The last pack record should have the codebase item "{item_id}"')
+def step_impl(context, item_id):
+    with open(context.last_pack_filepath) as f:
+        assert json.load(f)['codebase']['itemId'] == item_id
+
+
+@behave.then(u'The last pack record should not exist')
+def step_impl(context):
+    assert not os.path.exists(context.last_pack_filepath)
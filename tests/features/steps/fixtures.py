@@ -1,6 +1,7 @@
 from behave import fixture
 import os
 import json
+import time
 import datetime
 
 
@@ -172,3 +173,17 @@ def get_package_io(params, context):
 
     return val
 
+
+def wait_until(predicate, timeout=60, interval=0.5, factor=1.5, max_interval=10):
+    """
+    Poll predicate with exponential backoff until it returns a truthy value or the timeout passes
+
+    :return: the last predicate result
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = predicate()
+        if result or time.monotonic() >= deadline:
+            return result
+        time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        interval = min(interval * factor, max_interval)
@@ -1,4 +1,5 @@
 import os
+import copy
 import time
 import uuid
 import random
@@ -6,6 +7,18 @@ import random
 import dtlpy as dl
 import behave
 import json
+from .. import fixtures
+
+_PIPELINE_JSON_TEMPLATE = None
+
+
+def _load_pipeline_template():
+    global _PIPELINE_JSON_TEMPLATE
+    if _PIPELINE_JSON_TEMPLATE is None:
+        pipeline_path = os.path.join(os.environ['DATALOOP_TEST_ASSETS'], "pipeline_flow/pipeline_flow.json")
+        with open(pipeline_path, 'r') as f:
+            _PIPELINE_JSON_TEMPLATE = json.load(f)
+    return _PIPELINE_JSON_TEMPLATE
 
 
 @behave.when(u'I create a package and service to pipeline')
@@ -195,11 +208,7 @@ def step_impl(context, keep_triggers_active: str):
 
 @behave.when(u'I create a pipeline from json')
 def step_impl(context):
-    pipeline_path = os.path.join(os.environ['DATALOOP_TEST_ASSETS'], "pipeline_flow/pipeline_flow.json")
-
-    with open(pipeline_path, 'r') as f:
-        pipeline_json = json.load(f)
-
+    pipeline_json = copy.deepcopy(_load_pipeline_template())
     pipeline_json['projectId'] = context.project.id
 
     pipeline_json['nodes'][0]['namespace']['serviceName'] = context.service.name
@@ -227,28 +236,21 @@ def step_impl(context, item_path):
 
 @behave.then(u'verify pipeline flow result')
 def step_impl(context):
-    time.sleep(15)
-    context.item = context.dataset.items.get(item_id=context.item.id)
-    assert context.item.metadata['system'].get('fromPipe', False)
-    time.sleep(20)
-    context.item = context.dataset.items.get(item_id=context.item.id)
-    ass_id = None
-    for ref in context.item.metadata['system']['refs']:
-        if ref['type'] == 'assignment':
-            ass_id = ref['id']
-    context.item.update_status(status='complete', assignment_id=ass_id, clear=False)
-    current_num_of_tries = 0
-    flag = False
-    while flag is False and current_num_of_tries < 6:
-        time.sleep(10)
+    def refresh_item():
         context.item = context.dataset.items.get(item_id=context.item.id)
-        try:
-            if context.item.metadata['user'] == {'Hello': 'World'}:
-                flag = True
-        except:
-            current_num_of_tries += 1
+        return context.item
 
-    assert flag
+    def get_assignment_id():
+        for ref in refresh_item().metadata['system'].get('refs', list()):
+            if ref['type'] == 'assignment':
+                return ref['id']
+        return None
+
+    assert fixtures.wait_until(lambda: refresh_item().metadata['system'].get('fromPipe', False))
+    ass_id = fixtures.wait_until(get_assignment_id)
+    assert ass_id is not None, 'Item {} was not added to an assignment'.format(context.item.id)
+    context.item.update_status(status='complete', assignment_id=ass_id, clear=False)
+    assert fixtures.wait_until(lambda: refresh_item().metadata.get('user', None) == {'Hello': 'World'})
 
 
 @behave.when(u'I update the pipeline nodes')